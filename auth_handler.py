@@ -1,10 +1,17 @@
 """Authentication handler for API calls."""
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Union
 import base64
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Shared read-only mapping returned when no auth headers/params apply
+_EMPTY_MAPPING: Mapping[str, str] = MappingProxyType({})
+
+# Header values may be pre-encoded bytes, which httpx sends as-is
+HeaderValue = Union[str, bytes]
+
 
 class AuthHandler:
     """Handles authentication for API calls."""
@@ -22,12 +29,56 @@ class AuthHandler:
         self.auth_type = self.auth_config.get("type")
         self.credentials = self.auth_config.get("credentials", {})
         
-        logger.debug(f"Initialized AuthHandler with type: {self.auth_type}")
+        # Raw "username:password" bytes for Basic auth (None otherwise),
+        # kept so rebuild_basic() can refresh the header after rotation
+        self._basic_credentials = self._encode_basic_credentials()
+        
+        # Credentials are fixed for the life of the handler, so build the
+        # auth headers/query params once instead of on every request.
+        self._cached_headers = self._freeze(self._build_headers())
+        self._cached_query = self._freeze(self._build_query_params())
+        
+        logger.debug("Initialized AuthHandler with type: %s", self.auth_type)
     
-    def get_headers(self) -> Dict[str, str]:
+    def get_headers(self) -> Mapping[str, HeaderValue]:
         """
         Get authentication headers to add to requests.
         
+        Authorization values are pre-encoded bytes.
+        
+        Returns:
+            Read-only mapping of headers to include
+        """
+        return self._cached_headers
+    
+    def get_query_params(self) -> Mapping[str, str]:
+        """
+        Get authentication query parameters.
+        
+        Needed for API keys in query string.
+        
+        Returns:
+            Read-only mapping of query params to include
+        """
+        return self._cached_query
+    
+    @staticmethod
+    def _freeze(values: Dict[str, HeaderValue]) -> Mapping[str, HeaderValue]:
+        """
+        Wrap values in a read-only mapping, sharing one instance when empty.
+        
+        Args:
+            values: Headers or query params to freeze
+            
+        Returns:
+            Read-only view of the values
+        """
+        return MappingProxyType(values) if values else _EMPTY_MAPPING
+    
+    def _build_headers(self) -> Dict[str, HeaderValue]:
+        """
+        Build authentication headers for the configured auth type.
+        
         Returns:
             Dict of headers to include
         """
@@ -43,14 +94,12 @@ class AuthHandler:
         elif self.auth_type == "oauth2":
             return self._handle_oauth2()
         
-        logger.warning(f"Unknown auth type: {self.auth_type}")
+        logger.warning("Unknown auth type: %s", self.auth_type)
         return {}
     
-    def get_query_params(self) -> Dict[str, str]:
+    def _build_query_params(self) -> Dict[str, str]:
         """
-        Get authentication query parameters.
-        
-        Needed for API keys in query string.
+        Build authentication query parameters.
         
         Returns:
             Dict of query params to include
@@ -75,13 +124,13 @@ class AuthHandler:
             name = self.credentials.get("name", "X-API-Key")
             value = self.credentials.get("value", "")
             
-            logger.debug(f"Using API key in header: {name}")
+            logger.debug("Using API key in header: %s", name)
             return {name: value}
         
         # Query params handled separately
         return {}
     
-    def _handle_http_auth(self) -> Dict[str, str]:
+    def _handle_http_auth(self) -> Dict[str, HeaderValue]:
         """
         Handle HTTP authentication (Basic, Bearer).
         
@@ -93,24 +142,64 @@ class AuthHandler:
         if scheme == "bearer":
             token = self.credentials.get("token", "")
             logger.debug("Using Bearer authentication")
-            return {"Authorization": f"Bearer {token}"}
+            return {"Authorization": b"Bearer " + token.encode('utf-8')}
         
         elif scheme == "basic":
-            username = self.credentials.get("username", "")
-            password = self.credentials.get("password", "")
-            
-            # Encode credentials
-            credentials_str = f"{username}:{password}"
-            credentials_bytes = credentials_str.encode('utf-8')
-            encoded = base64.b64encode(credentials_bytes).decode('utf-8')
-            
             logger.debug("Using Basic authentication")
-            return {"Authorization": f"Basic {encoded}"}
+            return {"Authorization": b"Basic " + base64.b64encode(self._basic_credentials)}
         
-        logger.warning(f"Unknown HTTP scheme: {scheme}")
+        logger.warning("Unknown HTTP scheme: %s", scheme)
         return {}
     
-    def _handle_oauth2(self) -> Dict[str, str]:
+    def _encode_basic_credentials(self) -> Optional[bytes]:
+        """
+        Encode the Basic auth "username:password" pair.
+        
+        Returns:
+            UTF-8 credential bytes, or None if Basic auth is not configured
+        """
+        if self.auth_type != "http" or self.credentials.get("scheme", "bearer").lower() != "basic":
+            return None
+        
+        username = self.credentials.get("username", "")
+        password = self.credentials.get("password", "")
+        return f"{username}:{password}".encode('utf-8')
+    
+    def rebuild_basic(self, username: Optional[str] = None, password: Optional[str] = None) -> bytes:
+        """
+        Rebuild the Basic Authorization header, e.g. after credential rotation.
+        
+        New credentials are encoded once and stored as bytes; the header is
+        then rebuilt with a single base64 encode and replaces the cached one,
+        so subsequent requests use it.
+        
+        Args:
+            username: New username (keeps the current one if None)
+            password: New password (keeps the current one if None)
+            
+        Returns:
+            New Authorization header value
+            
+        Raises:
+            ValueError: If Basic authentication is not configured
+        """
+        if self._basic_credentials is None:
+            raise ValueError("Basic authentication is not configured")
+        
+        if username is not None or password is not None:
+            self.credentials = dict(self.credentials)
+            if username is not None:
+                self.credentials["username"] = username
+            if password is not None:
+                self.credentials["password"] = password
+            self._basic_credentials = self._encode_basic_credentials()
+        
+        authorization = b"Basic " + base64.b64encode(self._basic_credentials)
+        self._cached_headers = self._freeze({**self._cached_headers, "Authorization": authorization})
+        logger.debug("Rebuilt Basic authentication header")
+        return authorization
+    
+    def _handle_oauth2(self) -> Dict[str, HeaderValue]:
         """
         Handle OAuth2 authentication.
         
@@ -124,7 +213,7 @@ class AuthHandler:
         
         if access_token:
             logger.debug("Using OAuth2 authentication")
-            return {"Authorization": f"Bearer {access_token}"}
+            return {"Authorization": b"Bearer " + access_token.encode('utf-8')}
         
         logger.warning("OAuth2 access_token not provided")
         return {}
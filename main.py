@@ -11,6 +11,7 @@ import json
 import logging
 from pathlib import Path
 from typing import Dict
+import orjson
 import uvicorn
 from starlette.applications import Starlette
 from starlette.routing import Route
@@ -56,8 +57,9 @@ async def handle_messages(request):
 
 async def health_check(request):
     """Health check endpoint."""
+    # Starlette sends bytes content as-is, so skip the decode/re-encode
     return Response(
-        json.dumps({
+        orjson.dumps({
             "status": "healthy",
             "server": mcp_server.title if mcp_server else "Not initialized",
             "tools_count": len(mcp_server.tools) if mcp_server else 0
@@ -100,7 +102,9 @@ def initialize_server():
         title=config["server_name"],
         base_url=config["base_url"],
         tools=tools,
-        auth_handler=auth_handler
+        auth_handler=auth_handler,
+        cache_get_tools=config.get("cache_get_tools", False),
+        cache_ttl=config.get("cache_ttl", 30.0)
     )
     
     logger.info(f"MCP Server '{config['server_name']}' initialized successfully")
@@ -135,12 +139,15 @@ def main():
     logger.info(f"Server will be available at: {host}:{port}")
     logger.info("=" * 60)
     
-    # Run the server
+    # Run the server. "auto" picks uvloop and httptools (installed via
+    # uvicorn[standard]) and falls back to asyncio/h11 where unavailable.
     uvicorn.run(
         app,
         host=host,
         port=port,
-        log_level="info"
+        log_level="info",
+        loop="auto",
+        http="auto"
     )
 
 
@@ -1,6 +1,14 @@
 """Dynamic MCP Server implementation."""
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+import asyncio
+import json
+from typing import Awaitable, Callable, Dict, Any, FrozenSet, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+import re
+import time
 import httpx
+import orjson
 import mcp.types as types
 from mcp.server import Server
 from mcp.server.sse import SseServerTransport
@@ -11,6 +19,107 @@ from auth_handler import AuthHandler
 
 logger = logging.getLogger(__name__)
 
+# Path placeholders such as {petId}
+_PATH_RE = re.compile(r"\{(\w+)\}")
+
+# Methods whose leftover arguments are sent as the request body
+_BODY_METHODS = frozenset({"POST", "PUT", "PATCH"})
+
+# Hosts that default to plain HTTP when a base URL has no scheme
+_LOCAL_HOSTS = frozenset({"localhost", "127.0.0.1", "0.0.0.0"})
+
+# Sentinel for a response cache miss (None is a valid cached result)
+_CACHE_MISS = object()
+
+
+class _SafeDict(dict):
+    """Path parameter map that leaves unknown placeholders untouched."""
+    
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
+def _to_path_template(path: str) -> str:
+    """
+    Convert an endpoint path into a str.format_map template.
+    
+    Placeholders like {petId} are kept as format fields; any other braces
+    are escaped so they survive formatting literally. All-digit names such
+    as {0} would be positional fields, so they are escaped too and left for
+    execute_request to substitute with str.replace.
+    
+    Args:
+        path: Endpoint path (e.g., /users/{id})
+        
+    Returns:
+        Format template for the path
+    """
+    parts = _PATH_RE.split(path)
+    for i in range(0, len(parts), 2):
+        parts[i] = parts[i].replace("{", "{{").replace("}", "}}")
+    for i in range(1, len(parts), 2):
+        name = parts[i]
+        parts[i] = "{{" + name + "}}" if name.isdecimal() else "{" + name + "}"
+    return "".join(parts)
+
+
+def _normalize_base_url(base_url: str) -> str:
+    """
+    Ensure a base URL has a protocol.
+    
+    URLs without one get HTTPS for security, except local hosts which get
+    HTTP for development. A bare path is treated as relative to localhost.
+    
+    Args:
+        base_url: Base URL as configured
+        
+    Returns:
+        Base URL including protocol, without a trailing slash
+    """
+    base_url = base_url.rstrip('/')
+    if urlsplit(base_url).scheme in ("http", "https"):
+        return base_url
+    
+    parts = urlsplit(base_url if base_url.startswith('/') else "//" + base_url)
+    host = parts.hostname or "localhost"
+    scheme = "http" if host in _LOCAL_HOSTS else "https"
+    return urlunsplit((scheme, parts.netloc or host, parts.path, parts.query, parts.fragment))
+
+
+@dataclass(frozen=True, slots=True)
+class ToolPlan:
+    """Execution details for a tool, precomputed from its metadata."""
+    
+    method: str
+    path: str
+    path_template: str
+    path_keys: Tuple[str, ...]
+    path_key_set: FrozenSet[str]
+    is_body_method: bool
+    
+    @classmethod
+    def from_metadata(cls, metadata: Dict[str, Any]) -> "ToolPlan":
+        """
+        Build a plan from a tool's metadata.
+        
+        Args:
+            metadata: Tool metadata with "method" and "path" keys
+            
+        Returns:
+            Execution plan for the tool
+        """
+        method = metadata["method"]
+        path = metadata["path"]
+        path_keys = tuple(_PATH_RE.findall(path))
+        return cls(
+            method=method,
+            path=path,
+            path_template=_to_path_template(path),
+            path_keys=path_keys,
+            path_key_set=frozenset(path_keys),
+            is_body_method=method in _BODY_METHODS
+        )
+
 
 class APIRequestError(Exception):
     """Custom exception for API request failures."""
@@ -28,29 +137,21 @@ class APIClient:
             base_url: Base URL of the target API
             auth_handler: Authentication handler
         """
-        self.base_url = base_url.rstrip('/')
-
-        # Protocol constants
-        HTTP_PROTOCOL = "http"
-        HTTPS_PROTOCOL = "https"
-        PROTOCOL_SEPARATOR = "://"
-
-        # Ensure base_url has protocol
-        http_prefix = HTTP_PROTOCOL + PROTOCOL_SEPARATOR
-        https_prefix = HTTPS_PROTOCOL + PROTOCOL_SEPARATOR
-
-        if self.base_url.startswith('/'):
-            # Relative path, assume localhost with HTTP for development
-            protocol = HTTP_PROTOCOL if "localhost" in self.base_url or "127.0.0.1" in self.base_url else HTTPS_PROTOCOL
-            self.base_url = f"{protocol}{PROTOCOL_SEPARATOR}localhost{self.base_url}"
-        elif not self.base_url.startswith((http_prefix, https_prefix)):
-            # Missing protocol - use HTTPS for security (localhost gets HTTP)
-            protocol = HTTP_PROTOCOL if "localhost" in self.base_url or "127.0.0.1" in self.base_url else HTTPS_PROTOCOL
-            self.base_url = f"{protocol}{PROTOCOL_SEPARATOR}{self.base_url}" 
-            
+        self.base_url = _normalize_base_url(base_url)
         self.auth_handler = auth_handler
-        self.client = httpx.AsyncClient(timeout=30.0)
-        logger.debug(f"Initialized APIClient for {self.base_url}")
+        # One pooled client per API: keep-alive connections and HTTP/2
+        # multiplexing let repeated tool calls skip TCP/TLS handshakes
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=100,
+                max_connections=200,
+                keepalive_expiry=60.0
+            )
+        )
+        logger.debug("Initialized APIClient for %s", self.base_url)
     
     async def close(self):
         """Close the HTTP client."""
@@ -70,8 +171,10 @@ class APIClient:
         
         Args:
             method: HTTP method (GET, POST, etc.)
-            path: Endpoint path (e.g., /users/{id})
-            path_params: Path parameters to substitute
+            path: Endpoint path template (e.g., /users/{id}), in the form
+                  produced by _to_path_template
+            path_params: Path parameters to substitute. If None, path is
+                         used verbatim rather than as a template
             query_params: Query parameters
             headers: Request headers
             body: Request body
@@ -81,34 +184,33 @@ class APIClient:
         """
         # 1. Substitute path parameters
         url_path = path
-        if path_params:
+        if path_params is not None:
+            url_path = path.format_map(_SafeDict(path_params))
+            # All-digit names can't be format fields (see _to_path_template)
             for key, value in path_params.items():
-                url_path = url_path.replace(f"{{{key}}}", str(value))
-        
-        url = f"{self.base_url}{url_path}"
-        
-        # 2. Prepare headers
-        request_headers = {}
-        if self.auth_handler:
-            request_headers.update(self.auth_handler.get_headers())
+                if key.isdecimal():
+                    url_path = url_path.replace(f"{{{key}}}", str(value))
         
+        # 2. Prepare headers (auth headers are passed through untouched
+        #    unless the call adds its own; httpx copies them internally).
+        #    The handler's mapping is read per call so rebuilt credentials
+        #    take effect immediately.
+        auth = self.auth_handler
+        request_headers = (auth.get_headers() or None) if auth else None
         if headers:
-            request_headers.update(headers)
+            request_headers = {**request_headers, **headers} if request_headers else headers
             
         # 3. Prepare query params
-        request_query = {}
-        if self.auth_handler:
-            request_query.update(self.auth_handler.get_query_params())
-            
+        request_query = (auth.get_query_params() or None) if auth else None
         if query_params:
-            request_query.update(query_params)
+            request_query = {**request_query, **query_params} if request_query else query_params
             
         # 4. Execute request
-        logger.info(f"Executing {method} {url}")
+        logger.info("Executing %s %s%s", method, self.base_url, url_path)
         try:
             response = await self.client.request(
                 method=method,
-                url=url,
+                url=url_path,
                 params=request_query,
                 headers=request_headers,
                 json=body if body else None
@@ -117,34 +219,186 @@ class APIClient:
             # Raise for error status
             response.raise_for_status()
             
-            # Return JSON if possible, else text
-            try:
-                return response.json()
-            except (ValueError, TypeError):
-                return {"data": response.text}
+            # Return JSON if the response declares it, else text. Checking
+            # the content type first avoids a failed parse on non-JSON
+            # bodies. response.json() parses the raw bytes, so a body in a
+            # declared non-UTF-8 charset is parsed from the decoded text.
+            if "json" in response.headers.get("content-type", ""):
+                charset = (response.charset_encoding or "utf-8").lower()
+                try:
+                    if charset in ("utf-8", "utf8"):
+                        return response.json()
+                    return json.loads(response.text)
+                except (ValueError, TypeError):
+                    pass
+            return {"data": response.text}
                 
         except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error {e.response.status_code}: {e.response.text}")
+            logger.error("HTTP error %s: %s", e.response.status_code, e.response.text)
             raise APIRequestError(f"API request failed: {e.response.status_code} - {e.response.text}") from e
         except (httpx.RequestError, httpx.TimeoutException, httpx.NetworkError) as e:
-            logger.error(f"Request failed: {e}")
+            logger.error("Request failed: %s", e)
             raise APIRequestError(f"Request failed: {str(e)}") from e
 
 
 class ToolExecutor:
     """Executes MCP tools by calling the API client."""
     
-    def __init__(self, api_client: APIClient, tools_metadata: Dict[str, Dict]):
+    def __init__(
+        self,
+        api_client: APIClient,
+        tool_plans: Dict[str, ToolPlan],
+        cache_get_tools: bool = False,
+        cache_ttl: float = 30.0,
+        cache_maxsize: int = 512
+    ):
         """
         Initialize tool executor.
         
         Args:
             api_client: Initialized API client
-            tools_metadata: Metadata for each tool (method, path, etc.)
-                            Keyed by tool name.
+            tool_plans: Precomputed execution plan for each tool.
+                        Keyed by tool name.
+            cache_get_tools: Cache successful results of GET tools and share
+                             one API call between concurrent identical calls
+            cache_ttl: Seconds a cached result stays valid
+            cache_maxsize: Maximum number of cached results (LRU eviction)
         """
         self.api_client = api_client
-        self.tools_metadata = tools_metadata
+        self.tool_plans = tool_plans
+        self._tool_calls = {
+            name: self._specialize(plan) for name, plan in tool_plans.items()
+        }
+        self.cache_get_tools = cache_get_tools
+        self.cache_ttl = cache_ttl
+        self.cache_maxsize = cache_maxsize
+        self._response_cache: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        # Tasks for cacheable calls currently awaiting the API.
+        # Only touched between awaits on the event loop, so no lock is needed.
+        self._inflight: Dict[Tuple, "asyncio.Task[Any]"] = {}
+    
+    def _specialize(self, plan: ToolPlan) -> Callable[[Dict[str, Any]], Awaitable[Any]]:
+        """
+        Build a request function specialized to one tool.
+        
+        Everything fixed by the tool's metadata (method, path, placeholders,
+        whether leftover arguments become the body) is bound once here, so
+        a call only has to sort its arguments.
+        
+        Args:
+            plan: Execution plan for the tool
+            
+        Returns:
+            Coroutine function taking the tool arguments
+        """
+        execute_request = self.api_client.execute_request
+        method = plan.method
+        path_key_set = plan.path_key_set
+        is_body_method = plan.is_body_method
+        # Paths without placeholders are sent verbatim, skipping substitution
+        path = plan.path_template if path_key_set else plan.path
+        
+        async def call(arguments: Dict[str, Any]) -> Any:
+            # Separate arguments into path, query, header, and body in a
+            # single pass, without mutating the caller's dict.
+            # We need to know which param goes where.
+            # Ideally, metadata should contain this info.
+            # For now, we'll infer based on path placeholders and conventions:
+            # - path params are defined in the path string like {id}
+            # - header params are prefixed with header_
+            # - an explicit 'body' argument is used as the request body
+            # - everything else is a query param
+            path_params = {}
+            query_params = {}
+            header_params = {}
+            body = None
+            has_body = False
+            
+            for key, value in arguments.items():
+                if key in path_key_set:
+                    path_params[key] = value
+                elif key.startswith("header_"):
+                    header_params[key[7:]] = str(value)
+                elif key == "body":
+                    body = value
+                    has_body = True
+                else:
+                    query_params[key] = value
+            
+            if not has_body and is_body_method and query_params:
+                # If no explicit body param, but arguments remain and it's a body-method,
+                # treat remaining args as body properties (flattened body)
+                body = query_params
+                query_params = {}
+            
+            return await execute_request(
+                method=method,
+                path=path,
+                path_params=path_params if path_key_set else None,
+                query_params=query_params,
+                headers=header_params,
+                body=body
+            )
+        
+        return call
+    
+    @staticmethod
+    def _make_cache_key(tool_name: str, arguments: Dict[str, Any]) -> Optional[Tuple]:
+        """
+        Build a response cache key for a tool call.
+        
+        Args:
+            tool_name: Name of the tool
+            arguments: Tool arguments
+            
+        Returns:
+            Hashable key, or None if the arguments are not hashable
+        """
+        # Include each value's type: 1, 1.0 and True compare equal but
+        # render as different requests (/pet/1, /pet/1.0, /pet/True)
+        key = (tool_name, tuple(sorted(
+            (name, type(value), value) for name, value in arguments.items()
+        )))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    
+    def _cache_get(self, key: Tuple) -> Any:
+        """
+        Look up a cached result, dropping it if expired.
+        
+        Args:
+            key: Cache key from _make_cache_key
+            
+        Returns:
+            Cached result, or _CACHE_MISS
+        """
+        entry = self._response_cache.get(key)
+        if entry is None:
+            return _CACHE_MISS
+        
+        stored_at, result = entry
+        if time.monotonic() - stored_at >= self.cache_ttl:
+            del self._response_cache[key]
+            return _CACHE_MISS
+        
+        self._response_cache.move_to_end(key)
+        return result
+    
+    def _cache_put(self, key: Tuple, result: Any):
+        """
+        Store a result, evicting the least recently used entries.
+        
+        Args:
+            key: Cache key from _make_cache_key
+            result: Tool execution result
+        """
+        self._response_cache[key] = (time.monotonic(), result)
+        self._response_cache.move_to_end(key)
+        while len(self._response_cache) > self.cache_maxsize:
+            self._response_cache.popitem(last=False)
     
     async def execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
         """
@@ -157,75 +411,69 @@ class ToolExecutor:
         Returns:
             Tool execution result
         """
-        if tool_name not in self.tools_metadata:
+        plan = self.tool_plans.get(tool_name)
+        if plan is None:
             raise ValueError(f"Unknown tool: {tool_name}")
         
-        metadata = self.tools_metadata[tool_name]
-        method = metadata["method"]
-        path = metadata["path"]
+        # Serve repeated read-only calls from the response cache
+        cache_key = None
+        if self.cache_get_tools and plan.method == "GET":
+            cache_key = self._make_cache_key(tool_name, arguments)
+            if cache_key is not None:
+                cached = self._cache_get(cache_key)
+                if cached is not _CACHE_MISS:
+                    logger.debug("Cache hit for tool %s", tool_name)
+                    return cached
         
-        # Separate arguments into path, query, header, and body
-        path_params = {}
-        query_params = {}
-        header_params = {}
-        body = None
-        
-        # We need to know which param goes where.
-        # Ideally, metadata should contain this info.
-        # For now, we'll infer based on path placeholders and conventions.
-        
-        # 1. Extract path params
-        # Path params are defined in the path string like {id}
-        import re
-        path_keys = re.findall(r"\{(\w+)\}", path)
-        
-        for key in path_keys:
-            if key in arguments:
-                path_params[key] = arguments.pop(key)
-            else:
-                # Check if argument matches without braces (e.g. 'petId' for '{petId}')
-                pass
-        
-        # 2. Extract header params (prefixed with header_)
-        keys_to_remove = []
-        for key, value in arguments.items():
-            if key.startswith("header_"):
-                real_key = key.replace("header_", "")
-                header_params[real_key] = str(value)
-                keys_to_remove.append(key)
-        
-        for key in keys_to_remove:
-            arguments.pop(key)
-            
-        # 3. Handle body
-        # If there's a 'body' argument, use it as the request body
-        if "body" in arguments:
-            body = arguments.pop("body")
-        elif method in ["POST", "PUT", "PATCH"] and arguments:
-            # If no explicit body param, but arguments remain and it's a body-method,
-            # treat remaining args as body properties (flattened body)
-            body = arguments
-            arguments = {} # Consumed all args
-            
-        # 4. Remaining args are query params
-        query_params = arguments
+        if cache_key is None:
+            return await self._execute_uncached(tool_name, plan, arguments, None)
+        
+        # Coalesce concurrent identical calls onto the one already in flight.
+        # The API call runs as its own task and every caller awaits it through
+        # a shield, so cancelling one caller never cancels the shared call.
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._execute_uncached(tool_name, plan, arguments, cache_key)
+            )
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        else:
+            logger.debug("Joining in-flight call for tool %s", tool_name)
         
-        logger.info(f"Executing tool {tool_name}: {method} {path}")
+        return await asyncio.shield(task)
+    
+    async def _execute_uncached(
+        self,
+        tool_name: str,
+        plan: ToolPlan,
+        arguments: Dict[str, Any],
+        cache_key: Optional[Tuple]
+    ) -> Any:
+        """
+        Call the API for a tool through its specialized request function.
+        
+        Args:
+            tool_name: Name of the tool to execute
+            plan: Execution plan for the tool
+            arguments: Tool arguments provided by the LLM
+            cache_key: Response cache key to store the result under, if any
+            
+        Returns:
+            Tool execution result
+        """
+        logger.info("Executing tool %s: %s %s", tool_name, plan.method, plan.path)
         
         try:
-            result = await self.api_client.execute_request(
-                method=method,
-                path=path,
-                path_params=path_params,
-                query_params=query_params,
-                headers=header_params,
-                body=body
-            )
+            result = await self._tool_calls[tool_name](arguments)
+            
+            if cache_key is not None:
+                self._cache_put(cache_key, result)
             
             return result
             
         except Exception as e:
-            logger.error(f"Tool execution failed: {e}")
+            logger.error("Tool execution failed: %s", e)
             return {"error": str(e)}
 
 
@@ -240,7 +488,9 @@ class DynamicMCPServer:
         title: str, 
         base_url: str,
         tools: List[Dict], 
-        auth_handler: Optional[AuthHandler] = None
+        auth_handler: Optional[AuthHandler] = None,
+        cache_get_tools: bool = False,
+        cache_ttl: float = 30.0
     ):
         """
         Initialize Dynamic MCP Server.
@@ -251,19 +501,37 @@ class DynamicMCPServer:
             base_url: Target API base URL
             tools: List of MCP tool definitions
             auth_handler: Authentication handler
+            cache_get_tools: Cache results of GET tools
+            cache_ttl: Seconds a cached GET result stays valid
         """
         self.session_id = session_id
         self.title = title
         self.tools = tools
         
+        # Tool definitions are fixed for the server's lifetime, so build the
+        # MCP tool objects once and hand the same list to every list_tools call
+        self._tool_objects: List[types.Tool] = [
+            types.Tool(
+                name=tool["name"],
+                description=tool["description"],
+                inputSchema=tool["inputSchema"]
+            )
+            for tool in tools
+        ]
+        
         # Initialize API Client and Tool Executor
         self.api_client = APIClient(base_url, auth_handler)
         
-        # Create metadata map for executor
-        tools_metadata = {
-            t["name"]: t["metadata"] for t in tools
+        # Precompute per-tool execution plans for the executor
+        tool_plans = {
+            t["name"]: ToolPlan.from_metadata(t["metadata"]) for t in tools
         }
-        self.executor = ToolExecutor(self.api_client, tools_metadata)
+        self.executor = ToolExecutor(
+            self.api_client,
+            tool_plans,
+            cache_get_tools=cache_get_tools,
+            cache_ttl=cache_ttl
+        )
         
         # Initialize MCP Server
         self.app = Server(title)
@@ -272,7 +540,7 @@ class DynamicMCPServer:
         # Register handlers
         self._register_handlers()
         
-        logger.info(f"Initialized DynamicMCPServer '{title}' with {len(tools)} tools")
+        logger.info("Initialized DynamicMCPServer '%s' with %d tools", title, len(tools))
 
     def _register_handlers(self):
         """Register MCP tool handlers."""
@@ -280,31 +548,29 @@ class DynamicMCPServer:
         @self.app.list_tools()
         async def list_tools() -> List[types.Tool]:
             """List available tools."""
-            return [
-                types.Tool(
-                    name=tool["name"],
-                    description=tool["description"],
-                    inputSchema=tool["inputSchema"]
-                )
-                for tool in self.tools
-            ]
+            return self._tool_objects
             
         @self.app.call_tool()
         async def call_tool(name: str, arguments: Any) -> List[types.TextContent]:
             """Execute a tool."""
-            logger.info(f"MCP Tool Call: {name}")
+            logger.info("MCP Tool Call: %s", name)
             
             try:
                 result = await self.executor.execute_tool(name, arguments)
                 
-                # Format result as text
-                import json
-                text_content = json.dumps(result, indent=2, default=str)
+                # Format result as text. orjson rejects integers beyond
+                # 64 bits, so such results go through the stdlib encoder.
+                try:
+                    text_content = orjson.dumps(
+                        result, option=orjson.OPT_INDENT_2, default=str
+                    ).decode()
+                except orjson.JSONEncodeError:
+                    text_content = json.dumps(result, indent=2, default=str)
                 
                 return [types.TextContent(type="text", text=text_content)]
                 
             except Exception as e:
-                logger.error(f"Tool execution error: {e}")
+                logger.error("Tool execution error: %s", e)
                 return [types.TextContent(type="text", text=f"Error: {str(e)}")]
 
     async def handle_sse(self, request: Request) -> Response:
@@ -317,12 +583,10 @@ class DynamicMCPServer:
         Returns:
             SSE response
         """
-        import mcp.server.sse
-
         # The endpoint must match the router's path structure:
         # /api/v1/byom/test/messages/{session_id}
         endpoint = f"/api/v1/byom/test/messages/{self.session_id}"
-        self.transport = mcp.server.sse.SseServerTransport(endpoint)
+        self.transport = SseServerTransport(endpoint)
         
         async with self.transport.connect_sse(request.scope, request.receive, request._send) as streams:
             read_stream, write_stream = streams